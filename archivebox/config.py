@@ -7,14 +7,16 @@ import sys
 import json
 import getpass
 import shutil
-import django
+import importlib.util
 
+from ast import literal_eval
 from hashlib import md5
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Type, Tuple, Dict, Union, List
-from subprocess import run, PIPE, DEVNULL
-from configparser import ConfigParser
+from typing import Optional, Type, Tuple, Dict, Union, List, Callable
+from subprocess import run, call, PIPE, DEVNULL
 from collections import defaultdict
+from collections.abc import Mapping
 
 from .config_stubs import (
     SimpleConfigValueDict,
@@ -170,6 +172,12 @@ CONFIG_ALIASES = {
             for alias in default.get('aliases', ())
 }
 USER_CONFIG = {key for section in CONFIG_DEFAULTS.values() for key in section.keys()}
+# which section of ArchiveBox.conf each user config key belongs in
+CONFIG_SECTIONS = {
+    key: section_name
+    for section_name, section in CONFIG_DEFAULTS.items()
+        for key in section.keys()
+}
 
 def get_real_name(key: str) -> str:
     return CONFIG_ALIASES.get(key.upper().strip(), key.upper().strip())
@@ -253,6 +261,20 @@ CONFIG_HEADER = (
 
 """)
 
+# same leniency as ConfigParser: indented lines, KEY: val, and comments after [SECTION] headers
+CONFIG_SECTION_REGEX = re.compile(r'^[^\S\n]*\[([^\]\n]+)\][^\S\n]*(?:[;#].*)?$', re.MULTILINE)
+CONFIG_KEY_VAL_REGEX = re.compile(r'^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*[=:][^\S\n]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+DJANGO_VERSION_REGEX = re.compile(r'^VERSION = (\(.*\))$', re.MULTILINE)
+
+FlatConfigDefaults = Tuple[Tuple[str, ConfigDefaultValue, Optional[Type], Optional[Tuple[str, ...]]], ...]
+
+# {id(defaults): (defaults, ((key, default, type, aliases), ...))}
+FLAT_CONFIG_DEFAULTS_CACHE: Dict[int, Tuple[ConfigDefaultDict, FlatConfigDefaults]] = {}
+
+# {config_path: ((st_mtime_ns, st_size), config_file_vars)}
+CONFIG_FILE_CACHE: Dict[Path, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
 
 DERIVED_CONFIG_DEFAULTS: ConfigDefaultDict = {
     'TERM_WIDTH':               {'default': lambda c: lambda: shutil.get_terminal_size((100, 10)).columns},
@@ -279,8 +301,8 @@ DERIVED_CONFIG_DEFAULTS: ConfigDefaultDict = {
     'PYTHON_ENCODING':          {'default': lambda c: sys.stdout.encoding.upper()},
     'PYTHON_VERSION':           {'default': lambda c: '{}.{}.{}'.format(*sys.version_info[:3])},
 
-    'DJANGO_BINARY':            {'default': lambda c: django.__file__.replace('__init__.py', 'bin/django-admin.py')},
-    'DJANGO_VERSION':           {'default': lambda c: '{}.{}.{} {} ({})'.format(*django.VERSION)},
+    'DJANGO_BINARY':            {'default': lambda c: get_django_info()[0].replace('__init__.py', 'bin/django-admin.py')},
+    'DJANGO_VERSION':           {'default': lambda c: '{}.{}.{} {} ({})'.format(*get_django_info()[1])},
 
     'USE_CURL':                 {'default': lambda c: c['USE_CURL'] and (c['SAVE_FAVICON'] or c['SAVE_TITLE'] or c['SAVE_ARCHIVE_DOT_ORG'])},
     'CURL_VERSION':             {'default': lambda c: bin_version(c['CURL_BINARY']) if c['USE_CURL'] else None},
@@ -340,24 +362,58 @@ DERIVED_CONFIG_DEFAULTS: ConfigDefaultDict = {
 
 ################################### Helpers ####################################
 
+BOOL_TRUE_VALUES = frozenset(('true', 'yes', '1'))
+BOOL_FALSE_VALUES = frozenset(('false', 'no', '0'))
+BOOL_VALUES = BOOL_TRUE_VALUES | BOOL_FALSE_VALUES
+
+# the parsers below are always passed an already-stripped val by load_config_val()
+def parse_bool_val(key: str, val: str) -> bool:
+    val_lower = val.lower()
+    if val_lower in BOOL_TRUE_VALUES:
+        return True
+    elif val_lower in BOOL_FALSE_VALUES:
+        return False
+    raise ValueError(f'Invalid configuration option {key}={val} (expected a boolean: True/False)')
+
+def parse_str_val(key: str, val: str) -> str:
+    if val.lower() in BOOL_VALUES:
+        raise ValueError(f'Invalid configuration option {key}={val} (expected a string)')
+    return val
+
+def parse_int_val(key: str, val: str) -> int:
+    if not val.isdigit():
+        raise ValueError(f'Invalid configuration option {key}={val} (expected an integer)')
+    return int(val)
+
+def parse_json_val(key: str, val: str) -> ConfigValue:
+    return json.loads(val)
+
+CONFIG_VAL_PARSERS: Dict[Type, Callable[[str, str], ConfigValue]] = {
+    bool: parse_bool_val,
+    str: parse_str_val,
+    int: parse_int_val,
+    list: parse_json_val,
+}
+
 def load_config_val(key: str,
                     default: ConfigDefaultValue=None,
                     type: Optional[Type]=None,
                     aliases: Optional[Tuple[str, ...]]=None,
                     config: Optional[ConfigDict]=None,
-                    env_vars: Optional[os._Environ]=None,
+                    env_vars: Optional[Dict[str, str]]=None,
                     config_file_vars: Optional[Dict[str, str]]=None) -> ConfigValue:
     """parse bool, int, and str key=value pairs from env"""
 
-
-    config_keys_to_check = (key, *(aliases or ()))
-    for key in config_keys_to_check:
+    # use the first non-empty value, checking each name in order and env vars before the config file,
+    # if there is none, val is left as the last name's raw value (e.g. '') in the last source
+    val = None
+    for name in (key, *(aliases or ())):
         if env_vars:
-            val = env_vars.get(key)
+            val = env_vars.get(name)
             if val:
                 break
         if config_file_vars:
-            val = config_file_vars.get(key)
+            val = config_file_vars.get(name)
             if val:
                 break
 
@@ -368,28 +424,59 @@ def load_config_val(key: str,
 
         return default
 
-    elif type is bool:
-        if val.lower() in ('true', 'yes', '1'):
-            return True
-        elif val.lower() in ('false', 'no', '0'):
-            return False
-        else:
-            raise ValueError(f'Invalid configuration option {key}={val} (expected a boolean: True/False)') 
+    parse_val = CONFIG_VAL_PARSERS.get(type)
+    if parse_val is None:
+        raise Exception('Config values can only be str, bool, int or json')
+    return parse_val(key, val.strip())
+
+
+def parse_config_file(text: str) -> Dict[str, Dict[str, str]]:
+    """parse the [SECTION] + KEY=value ini format of ArchiveBox.conf into {section: {key: val}}"""
+
+    # ArchiveBox.conf never uses interpolation or multiline values, so two regexes
+    # are enough and are much cheaper than going through ConfigParser on every run
+    sections: Dict[str, Dict[str, str]] = {}
+    headers = list(CONFIG_SECTION_REGEX.finditer(text))
+    for idx, header in enumerate(headers):
+        end = headers[idx + 1].start() if idx + 1 < len(headers) else len(text)
+        section = sections.setdefault(header.group(1).strip(), {})
+        section.update(CONFIG_KEY_VAL_REGEX.findall(text, header.end(), end))
+    return sections
+
 
-    elif type is str:
-        if val.lower() in ('true', 'false', 'yes', 'no', '1', '0'):
-            raise ValueError(f'Invalid configuration option {key}={val} (expected a string)')
-        return val.strip()
+def set_config_file_values(text: str, section: str, values: Dict[str, str]) -> str:
+    """set each KEY = val under [SECTION] in the raw ini text, leaving the rest of the text untouched"""
 
-    elif type is int:
-        if not val.isdigit():
-            raise ValueError(f'Invalid configuration option {key}={val} (expected an integer)')
-        return int(val)
+    new_lines = {key.upper(): f'{key} = {val}' for key, val in values.items()}
+    header = next((match for match in CONFIG_SECTION_REGEX.finditer(text) if match.group(1).strip() == section), None)
+    if header is None:
+        # add the missing section to the end, separated from the previous one by a blank line
+        prefix = f'{text.rstrip()}\n\n' if text.strip() else ''
+        return '{}[{}]\n{}\n\n'.format(prefix, section, '\n'.join(new_lines.values()))
 
-    elif type is list:
-        return json.loads(val)
+    next_header = CONFIG_SECTION_REGEX.search(text, header.end())
+    section_end = next_header.start() if next_header else len(text)
+    body = text[header.end():section_end]
 
-    raise Exception('Config values can only be str, bool, int or json')
+    # keys are case-insensitive when loaded, so replace any existing lines for the keys in one pass
+    replaced = set()
+    def replace_line(match):
+        key = match.group(1).upper()
+        replaced.add(key)
+        return new_lines[key]
+
+    keys_ptn = '|'.join(re.escape(key) for key in new_lines)
+    key_lines = re.compile(rf'^[^\S\n]*({keys_ptn})[^\S\n]*[=:].*$', re.MULTILINE | re.IGNORECASE)
+    body = key_lines.sub(replace_line, body)
+
+    missing_lines = [line for key, line in new_lines.items() if key not in replaced]
+    if missing_lines:
+        # add them right after the last non-blank line in the section
+        content = body.rstrip()
+        trailing_whitespace = body[len(content):] or '\n'
+        body = '{}\n{}{}'.format(content, '\n'.join(missing_lines), trailing_whitespace)
+
+    return f'{text[:header.end()]}{body}{text[section_end:]}'
 
 
 def load_config_file(out_dir: str=None) -> Optional[Dict[str, str]]:
@@ -397,20 +484,28 @@ def load_config_file(out_dir: str=None) -> Optional[Dict[str, str]]:
 
     out_dir = out_dir or Path(os.getenv('OUTPUT_DIR', '.')).resolve()
     config_path = Path(out_dir) / CONFIG_FILENAME
-    if config_path.exists():
-        config_file = ConfigParser()
-        config_file.optionxform = str 
-        config_file.read(config_path)
-        # flatten into one namespace
-        config_file_vars = {
-            key.upper(): val
-            for section, options in config_file.items()
-                for key, val in options.items()
-        }
-        # print('[i] Loaded config file', os.path.abspath(config_path))
-        # print(config_file_vars)
-        return config_file_vars
-    return None
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        return None
+
+    # load_config() runs once per config section, so only re-parse if the file changed
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cached = CONFIG_FILE_CACHE.get(config_path)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+
+    sections = parse_config_file(config_path.read_text(encoding='utf-8'))
+    # flatten into one namespace
+    config_file_vars = {
+        key.upper(): val
+        for section, options in sections.items()
+            for key, val in options.items()
+    }
+    # print('[i] Loaded config file', os.path.abspath(config_path))
+    # print(config_file_vars)
+    CONFIG_FILE_CACHE[config_path] = (cache_key, config_file_vars)
+    return config_file_vars
 
 
 def write_config_file(config: Dict[str, str], out_dir: str=None) -> ConfigDict:
@@ -421,55 +516,53 @@ def write_config_file(config: Dict[str, str], out_dir: str=None) -> ConfigDict:
     out_dir = out_dir or Path(os.getenv('OUTPUT_DIR', '.')).resolve()
     config_path = Path(out_dir) /  CONFIG_FILENAME
     
-    if not config_path.exists():
-        atomic_write(config_path, CONFIG_HEADER)
-
-    config_file = ConfigParser()
-    config_file.optionxform = str
-    config_file.read(config_path)
-
-    with open(config_path, 'r') as old:
-        atomic_write(f'{config_path}.bak', old.read())
+    if config_path.exists():
+        old_config_text = config_path.read_text(encoding='utf-8')
+    else:
+        old_config_text = CONFIG_HEADER
+        atomic_write(config_path, old_config_text)
 
-    find_section = lambda key: [name for name, opts in CONFIG_DEFAULTS.items() if key in opts][0]
+    # read the file once, and use the same text for both the backup and the edits
+    atomic_write(f'{config_path}.bak', old_config_text)
 
-    # Set up sections in empty config file
+    # edit the raw text in place so that comments and formatting are preserved
+    config_by_section: Dict[str, Dict[str, str]] = defaultdict(dict)
     for key, val in config.items():
-        section = find_section(key)
-        if section in config_file:
-            existing_config = dict(config_file[section])
-        else:
-            existing_config = {}
-        config_file[section] = {**existing_config, key: val}
+        config_by_section[CONFIG_SECTIONS[key]][key] = val
+
+    new_config_text = old_config_text
+    for section, section_config in config_by_section.items():
+        new_config_text = set_config_file_values(new_config_text, section, section_config)
 
     # always make sure there's a SECRET_KEY defined for Django
-    existing_secret_key = None
-    if 'SERVER_CONFIG' in config_file and 'SECRET_KEY' in config_file['SERVER_CONFIG']:
-        existing_secret_key = config_file['SERVER_CONFIG']['SECRET_KEY']
+    existing_secret_key = parse_config_file(new_config_text).get('SERVER_CONFIG', {}).get('SECRET_KEY')
 
     if (not existing_secret_key) or ('not a valid secret' in existing_secret_key):
         from django.utils.crypto import get_random_string
         chars = 'abcdefghijklmnopqrstuvwxyz0123456789-_+!.'
         random_secret_key = get_random_string(50, chars)
-        if 'SERVER_CONFIG' in config_file:
-            config_file['SERVER_CONFIG']['SECRET_KEY'] = random_secret_key
-        else:
-            config_file['SERVER_CONFIG'] = {'SECRET_KEY': random_secret_key}
+        new_config_text = set_config_file_values(new_config_text, 'SERVER_CONFIG', {'SECRET_KEY': random_secret_key})
 
-    with open(config_path, 'w+') as new:
-        config_file.write(new)
+    atomic_write(config_path, new_config_text)
+    CONFIG_FILE_CACHE.clear()
     
     try:
-        # validate the config by attempting to re-parse it
-        CONFIG = load_all_config()
+        # validate the config by attempting to re-parse the sections that changed, then the
+        # derived config too, as it parses some of the user values further (e.g. URL_BLACKLIST)
+        CONFIG = load_all_config(eager=False)
+        new_config: ConfigDict = {}
+        for section, section_config in config_by_section.items():
+            section_values = CONFIG.keys_in(section)
+            new_config.update({key: section_values[key] for key in section_config.keys()})
+        CONFIG.keys_in(LazyFlatConfig.DERIVED_SECTION)
         return {
-            key.upper(): CONFIG.get(key.upper())
+            key.upper(): new_config[key]
             for key in config.keys()
         }
     except:
         # something went horribly wrong, rever to the previous version
-        with open(f'{config_path}.bak', 'r') as old:
-            atomic_write(config_path, old.read())
+        atomic_write(config_path, old_config_text)
+        CONFIG_FILE_CACHE.clear()
 
     if Path(f'{config_path}.bak').exists():
         os.remove(f'{config_path}.bak')
@@ -478,6 +571,22 @@ def write_config_file(config: Dict[str, str], out_dir: str=None) -> ConfigDict:
 
    
 
+def flatten_config_defaults(defaults: ConfigDefaultDict) -> FlatConfigDefaults:
+    """get the (key, default, type, aliases) of each config option, cached per defaults dict"""
+
+    # the cache holds a reference to the defaults dict too, so its id() can't get reused
+    cached = FLAT_CONFIG_DEFAULTS_CACHE.get(id(defaults))
+    if cached and cached[0] is defaults:
+        return cached[1]
+
+    flat_defaults = tuple(
+        (key, default['default'], default.get('type'), default.get('aliases'))
+        for key, default in defaults.items()
+    )
+    FLAT_CONFIG_DEFAULTS_CACHE[id(defaults)] = (defaults, flat_defaults)
+    return flat_defaults
+
+
 def load_config(defaults: ConfigDefaultDict,
                 config: Optional[ConfigDict]=None,
                 out_dir: Optional[str]=None,
@@ -488,13 +597,13 @@ def load_config(defaults: ConfigDefaultDict,
     config_file_vars = config_file_vars or load_config_file(out_dir=out_dir)
 
     extended_config: ConfigDict = config.copy() if config else {}
-    for key, default in defaults.items():
+    for key, default, type, aliases in flatten_config_defaults(defaults):
         try:
             extended_config[key] = load_config_val(
                 key,
-                default=default['default'],
-                type=default.get('type'),
-                aliases=default.get('aliases'),
+                default=default,
+                type=type,
+                aliases=aliases,
                 config=extended_config,
                 env_vars=env_vars,
                 config_file_vars=config_file_vars,
@@ -502,15 +611,17 @@ def load_config(defaults: ConfigDefaultDict,
         except KeyboardInterrupt:
             raise SystemExit(0)
         except Exception as e:
-            stderr()
-            stderr(f'[X] Error while loading configuration value: {key}', color='red', config=extended_config)
-            stderr('    {}: {}'.format(e.__class__.__name__, e))
-            stderr()
-            stderr('    Check your config for mistakes and try again (your archive data is unaffected).')
-            stderr()
-            stderr('    For config documentation and examples see:')
-            stderr('        https://github.com/ArchiveBox/ArchiveBox/wiki/Configuration')
-            stderr()
+            ansi = DEFAULT_CLI_COLORS if extended_config.get('USE_COLOR') else ANSI
+            stderr(
+                '\n'
+                f'{ansi["red"]}[X] Error while loading configuration value: {key}{ansi["reset"]}\n'
+                f'    {e.__class__.__name__}: {e}\n'
+                '\n'
+                '    Check your config for mistakes and try again (your archive data is unaffected).\n'
+                '\n'
+                '    For config documentation and examples see:\n'
+                '        https://github.com/ArchiveBox/ArchiveBox/wiki/Configuration\n'
+            )
             raise
             raise SystemExit(2)
     
@@ -596,6 +707,17 @@ def bin_hash(binary: Optional[str]) -> Optional[str]:
             
     return f'md5:{file_hash.hexdigest()}'
 
+@lru_cache(maxsize=None)
+def get_django_info() -> Tuple[str, tuple]:
+    """find django's __init__.py path and VERSION tuple without importing it (import django alone is slow)"""
+    django_init_path = importlib.util.find_spec('django').origin
+    version_match = DJANGO_VERSION_REGEX.search(Path(django_init_path).read_text(encoding='utf-8'))
+    if version_match:
+        return django_init_path, literal_eval(version_match.group(1))
+
+    import django
+    return django.__file__, django.VERSION
+
 def find_chrome_binary() -> Optional[str]:
     """find any installed chrome binaries in the default locations"""
     # Precedence: Chromium, Chrome, Beta, Canary, Unstable, Dev
@@ -640,20 +762,31 @@ def find_chrome_data_dir() -> Optional[str]:
         '~/.config/google-chrome-unstable',
         '~/.config/google-chrome-dev',
     )
-    for path in default_profile_paths:
-        full_path = Path(path).resolve()
-        if full_path.exists():
-            return full_path
-    return None
+    full_path = next((path for path in map(os.path.abspath, default_profile_paths) if path_exists(path)), None)
+    return Path(full_path).resolve() if full_path else None
+
+@lru_cache(maxsize=None)
+def path_exists(path: str) -> bool:
+    """single stat() per unique absolute path, cached for the lifetime of the process"""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
 
 def wget_supports_compression(config):
+    return wget_binary_supports_compression(config['WGET_BINARY'])
+
+@lru_cache(maxsize=8)
+def wget_binary_supports_compression(wget_binary: str) -> bool:
+    # the answer can't change during the lifetime of the process, so only spawn wget once per binary
     try:
         cmd = [
-            config['WGET_BINARY'],
+            wget_binary,
             "--compression=auto",
             "--help",
         ]
-        return not run(cmd, stdout=DEVNULL, stderr=DEVNULL).returncode
+        return not call(cmd, stdout=DEVNULL, stderr=DEVNULL)
     except (FileNotFoundError, OSError):
         return False
 
@@ -829,7 +962,59 @@ def get_chrome_info(config: ConfigDict) -> ConfigValue:
 ################################## Load Config #################################
 
 
-def load_all_config():
+class LazyFlatConfig(Mapping):
+    """
+    Read-only flat view of the config that only loads the sections it needs.
+
+    Sections are loaded in the same order as load_all_config() (each one may
+    depend on values from the ones before it), and DERIVED_CONFIG_DEFAULTS,
+    which runs the slow binary/version checks, is only loaded once a derived
+    key is actually looked up.
+    """
+
+    DERIVED_SECTION = 'DERIVED_CONFIG'
+
+    def __init__(self) -> None:
+        self._section_defaults: Dict[str, ConfigDefaultDict] = {
+            **CONFIG_DEFAULTS,
+            self.DERIVED_SECTION: DERIVED_CONFIG_DEFAULTS,
+        }
+        # derived values override user values with the same key
+        self._key_sections: Dict[str, str] = {
+            **CONFIG_SECTIONS,
+            **{key: self.DERIVED_SECTION for key in DERIVED_CONFIG_DEFAULTS.keys()},
+        }
+        self._sections: Dict[str, ConfigDict] = {}
+        self._resolved: ConfigDict = {}
+
+    def _load_through(self, section_name: str) -> None:
+        for name, section_defaults in self._section_defaults.items():
+            if name not in self._sections:
+                self._resolved = load_config(section_defaults, self._resolved)
+                self._sections[name] = {key: self._resolved[key] for key in section_defaults.keys()}
+            if name == section_name:
+                return
+
+    def keys_in(self, section_name: str) -> ConfigDict:
+        """load (only) up to the given section and return its values"""
+        self._load_through(section_name)
+        return self._sections[section_name]
+
+    def __getitem__(self, key: str) -> ConfigValue:
+        self._load_through(self._key_sections[key])
+        return self._resolved[key]
+
+    def __iter__(self):
+        return iter(self._key_sections)
+
+    def __len__(self) -> int:
+        return len(self._key_sections)
+
+
+def load_all_config(eager: bool=True) -> Union[ConfigDict, LazyFlatConfig]:
+    if not eager:
+        return LazyFlatConfig()
+
     CONFIG: ConfigDict = {}
     for section_name, section_config in CONFIG_DEFAULTS.items():
         CONFIG = load_config(section_config, CONFIG)
@@ -976,20 +1161,28 @@ def check_data_folder(out_dir: Optional[str]=None, config: ConfigDict=CONFIG) ->
 
 
 
+DJANGO_SET_UP = False
+
 def setup_django(out_dir: Path=None, check_db=False, config: ConfigDict=CONFIG) -> None:
-    check_system_config()
-    
+    global DJANGO_SET_UP
+
     output_dir = out_dir or Path(config['OUTPUT_DIR'])
 
     assert isinstance(output_dir, Path) and isinstance(config['PACKAGE_DIR'], Path)
 
     try:
-        import django
-        sys.path.append(str(config['PACKAGE_DIR']))
-        os.environ.setdefault('OUTPUT_DIR', str(output_dir))
-        assert (config['PACKAGE_DIR'] / 'core' / 'settings.py').exists(), 'settings.py was not found at archivebox/core/settings.py'
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-        django.setup()
+        # setup_django() is called before every index read/write, but django only needs to
+        # be set up once per process (OUTPUT_DIR and DJANGO_SETTINGS_MODULE can't change after)
+        if not DJANGO_SET_UP:
+            check_system_config()
+
+            import django
+            sys.path.append(str(config['PACKAGE_DIR']))
+            os.environ.setdefault('OUTPUT_DIR', str(output_dir))
+            assert (config['PACKAGE_DIR'] / 'core' / 'settings.py').exists(), 'settings.py was not found at archivebox/core/settings.py'
+            os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+            django.setup()
+            DJANGO_SET_UP = True
 
         if check_db:
             sql_index_path = Path(output_dir) / SQL_INDEX_FILENAME
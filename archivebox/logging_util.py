@@ -175,14 +175,17 @@ def progress_bar(seconds: int, prefix: str='') -> None:
 def log_cli_command(subcommand: str, subcommand_args: List[str], stdin: Optional[str], pwd: str):
     from .config import VERSION, ANSI
     cmd = ' '.join(('archivebox', subcommand, *subcommand_args))
-    stderr('{black}[i] [{now}] ArchiveBox v{VERSION}: {cmd}{reset}'.format(
-        now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        VERSION=VERSION,
-        cmd=cmd,
-        **ANSI,
-    ))
-    stderr('{black}    > {pwd}{reset}'.format(pwd=pwd, **ANSI))
-    stderr()
+    # printed on every run, so format the whole block up front and write it out in one go
+    stderr(
+        '{black}[i] [{now}] ArchiveBox v{VERSION}: {cmd}{reset}\n'
+        '{black}    > {pwd}{reset}\n'.format(
+            now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            VERSION=VERSION,
+            cmd=cmd,
+            pwd=pwd,
+            **ANSI,
+        )
+    )
 
 ### Parsing Stage
 
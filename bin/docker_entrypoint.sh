@@ -11,9 +11,12 @@ GRID=$(stat --format="%g" "$DATA_DIR")
 if [[ "$USID" != 0 && "$GRID" != 0 ]]; then
     usermod -u "$USID" "$ARCHIVEBOX_USER" > /dev/null 2>&1
     groupmod -g "$GRID" "$ARCHIVEBOX_USER" > /dev/null 2>&1
-    chown -R "$USID":"$GRID" "/home/$ARCHIVEBOX_USER"
-    chown "$USID":"$GRID" "$DATA_DIR"
-    chown "$USID":"$GRID" "$DATA_DIR/*" > /dev/null 2>&1 || true
+    # only chown the entries that don't already have the right owner, instead of
+    # re-chowning everything on every start (DATA_DIR itself is where USID,GID came from)
+    find "/home/$ARCHIVEBOX_USER" \( ! -user "$USID" -o ! -group "$GRID" \) \
+        -exec chown -h "$USID":"$GRID" {} + > /dev/null 2>&1 || true
+    find "$DATA_DIR" -mindepth 1 -maxdepth 1 \( ! -user "$USID" -o ! -group "$GRID" \) \
+        -exec chown -h "$USID":"$GRID" {} + > /dev/null 2>&1 || true
 fi
 
 # Run commands as the new archivebox user in Docker.
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from archivebox.config import (
+    parse_config_file,
+    set_config_file_values,
+    load_config_file,
+    load_all_config,
+    load_config,
+    CONFIG_DEFAULTS,
+)
+
+from .fixtures import *
+
+def test_parse_config_file_reads_sections_and_values():
+    text = (
+        "# comment line\n"
+        "\n"
+        "[SERVER_CONFIG]\n"
+        "SECRET_KEY = abc=def \n"
+        "FOOTER_INFO =\n"
+        "\n"
+        "[GENERAL_CONFIG]\n"
+        "TIMEOUT=60\n"
+    )
+    assert parse_config_file(text) == {
+        "SERVER_CONFIG": {"SECRET_KEY": "abc=def", "FOOTER_INFO": ""},
+        "GENERAL_CONFIG": {"TIMEOUT": "60"},
+    }
+
+    # the same lenient syntax that ConfigParser accepts
+    assert parse_config_file("[GENERAL_CONFIG]\nTIMEOUT: 60\n") == {"GENERAL_CONFIG": {"TIMEOUT": "60"}}
+    assert parse_config_file("[GENERAL_CONFIG]\n  TIMEOUT = 60\n") == {"GENERAL_CONFIG": {"TIMEOUT": "60"}}
+    assert parse_config_file("[GENERAL_CONFIG] ; note\nTIMEOUT = 60\n") == {"GENERAL_CONFIG": {"TIMEOUT": "60"}}
+    assert parse_config_file("[GENERAL_CONFIG]  # note\nURL_BLACKLIST = a:b\n") == {"GENERAL_CONFIG": {"URL_BLACKLIST": "a:b"}}
+
+def test_config_set_and_get(process):
+    set_process = subprocess.run(["archivebox", "config", "--set", "TIMEOUT=123"], capture_output=True)
+    assert "TIMEOUT=123" in set_process.stdout.decode("utf-8")
+
+    get_process = subprocess.run(["archivebox", "config", "--get", "TIMEOUT"], capture_output=True)
+    assert "TIMEOUT=123" in get_process.stdout.decode("utf-8")
+
+def test_config_set_invalid_value_is_rolled_back(process):
+    # URL_BLACKLIST is only compiled into a regex by the derived config
+    subprocess.run(["archivebox", "config", "--set", "URL_BLACKLIST=("], capture_output=True)
+    assert "URL_BLACKLIST" not in (Path(".") / "ArchiveBox.conf").read_text()
+
+    get_process = subprocess.run(["archivebox", "config", "--get", "TIMEOUT"], capture_output=True)
+    assert get_process.returncode == 0
+    assert "TIMEOUT=60" in get_process.stdout.decode("utf-8")
+
+def test_load_config_file_picks_up_changes(tmp_path):
+    config_path = tmp_path / "ArchiveBox.conf"
+    config_path.write_text("[GENERAL_CONFIG]\nTIMEOUT = 60\n")
+    assert load_config_file(out_dir=tmp_path) == {"TIMEOUT": "60"}
+    assert load_config_file(out_dir=tmp_path) is load_config_file(out_dir=tmp_path)
+
+    config_path.write_text("[GENERAL_CONFIG]\nTIMEOUT = 120\n")
+    assert load_config_file(out_dir=tmp_path) == {"TIMEOUT": "120"}
+
+def test_lazy_config_matches_eager_config():
+    eager_config = load_all_config()
+    lazy_config = load_all_config(eager=False)
+    assert lazy_config["TIMEOUT"] == eager_config["TIMEOUT"]
+    assert "DERIVED_CONFIG" not in lazy_config._sections
+
+    assert set(lazy_config) == set(eager_config)
+    assert lazy_config["SAVE_WGET"] == eager_config["SAVE_WGET"]
+
+def test_empty_config_values_fall_back(tmp_path):
+    (tmp_path / "ArchiveBox.conf").write_text("[ARCHIVE_METHOD_TOGGLES]\nSAVE_PDF =\nSAVE_DOM = False\n")
+    config_file_vars = load_config_file(out_dir=tmp_path)
+    env_vars = {"SAVE_PDF": "", "SAVE_DOM": ""}
+    config = load_config(CONFIG_DEFAULTS["ARCHIVE_METHOD_TOGGLES"], env_vars=env_vars, config_file_vars=config_file_vars)
+    assert config["SAVE_PDF"] is True
+    assert config["SAVE_DOM"] is False
+
+def test_set_config_file_values_preserves_comments():
+    text = "# my notes\n\n[GENERAL_CONFIG]\n# keep me\ntimeout = 60\n\n[SERVER_CONFIG]\nDEBUG = False\n"
+    text = set_config_file_values(text, "GENERAL_CONFIG", {"TIMEOUT": "120", "ONLY_NEW": "False", "MEDIA_TIMEOUT": "5"})
+    text = set_config_file_values(text, "ARCHIVE_METHOD_TOGGLES", {"SAVE_PDF": "False", "SAVE_DOM": "False"})
+    assert text == (
+        "# my notes\n\n[GENERAL_CONFIG]\n# keep me\nTIMEOUT = 120\nONLY_NEW = False\nMEDIA_TIMEOUT = 5\n\n"
+        "[SERVER_CONFIG]\nDEBUG = False\n\n"
+        "[ARCHIVE_METHOD_TOGGLES]\nSAVE_PDF = False\nSAVE_DOM = False\n\n"
+    )
+
+    text = "[GENERAL_CONFIG] ; note\n  TIMEOUT: 60\n"
+    assert set_config_file_values(text, "GENERAL_CONFIG", {"TIMEOUT": "120"}) == "[GENERAL_CONFIG] ; note\nTIMEOUT = 120\n"